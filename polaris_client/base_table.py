@@ -25,9 +25,12 @@ class BaseTable:
         self._align = None
         self._col_fmt = None
         self.sample_size = 10
+        # (headers object, width, padded result) memo for pad_headers
+        self._padded_cache = (None, -1, None)
 
     def headers(self, headers):
         self._headers = headers
+        self._padded_cache = (None, -1, None)
 
     def alignments(self, align):
         self._align = align
@@ -36,55 +39,51 @@ class BaseTable:
         self._col_fmt = col_fmt
 
     def row_width(self, rows):
-        max_width = 0
-        min_width = None
+        lens = [len(row) for row in rows]
         if self._headers is not None:
-            max_width = len(self._headers)
-            min_width = max_width
-        for row in rows:
-            max_width = max(max_width, len(row))
-            min_width = max_width if min_width is None else min(min_width, max_width)
-        min_width = max_width if min_width is None else min_width
-        return (min_width, max_width)
+            lens.append(len(self._headers))
+        if not lens:
+            return (0, 0)
+        return (min(lens), max(lens))
 
     def find_alignments(self, rows, width):
         align = padded(self._align, width, None)
-        unknown_count = 0
-        for v in align:
-            if v is None:
-                unknown_count += 1
-        if unknown_count == 0:
+        unresolved = [i for i, a in enumerate(align) if a is None]
+        if not unresolved:
             return align
-        for row in rows:
-            for i in range(len(row)):
-                if align[i] is not None:
-                    continue
-                v = row[i]
-                if v is None:
-                    continue
-                if type(v) is str:
-                    align[i] = ALIGN_LEFT
-                else:
-                    align[i] = ALIGN_RIGHT
-                unknown_count -= 1
-                if unknown_count == 0:
-                    return align
-        for i in range(width):
-            if align[i] is None:
-                align[i] = ALIGN_LEFT
+        # Column-major scan: sample the first non-None value in each
+        # unresolved column rather than walking every cell of every row.
+        sample = rows[:self.sample_size]
+        for i in list(unresolved):
+            for row in sample:
+                if i < len(row) and row[i] is not None:
+                    align[i] = ALIGN_LEFT if isinstance(row[i], str) else ALIGN_RIGHT
+                    unresolved.remove(i)
+                    break
+        for i in unresolved:
+            align[i] = ALIGN_LEFT
         return align
 
     def pad_rows(self, rows, width):
-        new_rows = []
-        for row in rows:
-            new_rows.append(padded(row, width, None))
-        return new_rows
+        # Rows already at full width pass through untouched; only short
+        # rows pay for a new list.
+        return [row if len(row) >= width else row + [None] * (width - len(row))
+                for row in rows]
 
     def pad_headers(self, width):
         if self._headers is None:
             return None
         if len(self._headers) == 0:
             return None
+        # Repeated renders of an unchanged header list at the same width
+        # reuse the previous result rather than re-copying.
+        if self._padded_cache[0] is self._headers and self._padded_cache[1] == width:
+            return self._padded_cache[2]
+        result = self._pad_headers(width)
+        self._padded_cache = (self._headers, width, result)
+        return result
+
+    def _pad_headers(self, width):
         has_none = False
         for i in range(len(self._headers)):
             if self._headers[i] is None:
@@ -13,12 +13,37 @@
 # limitations under the License.
 
 from urllib.parse import quote
-import requests, json
-from .util import is_blank, dict_get
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import gzip
+import logging
+import requests, json, time
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from .util import is_blank
 from .show import Show
+
+# orjson serializes to bytes several times faster than the stdlib encoder.
+# It is optional: fall back to the stdlib when it is not installed.
+try:
+    import orjson
+    json_dumps = orjson.dumps
+except ImportError:
+    def json_dumps(obj):
+        return json.dumps(obj).encode()
+
+# ijson parses JSON incrementally, letting the table iterators below
+# yield entries without holding the whole response in memory. Optional.
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
 from .table import Table
 from . import consts
 
+log = logging.getLogger('polaris_client')
+
 POST_TOKEN = "https://id.{}imply.io/auth/realms/{}/protocol/openid-connect/token"
 BASE_URL = "https://api.{}imply.io/v1"
 REQ_TABLES = "/tables"
@@ -33,6 +58,74 @@ REQ_FILE = REQ_FILES + "/{}"
 # Internal Imply API to enable push streaming for a table
 REQ_ENABLE_PUSH = REQ_TABLE + '/ingestion/streaming'
 
+# Status codes checked on every response, bound to module-level ints so
+# the hot paths skip the LookupDict attribute lookups in requests.codes.
+OK = requests.codes.ok
+ACCEPTED = requests.codes.accepted
+NO_CONTENT = requests.codes.no_content
+UNAUTHORIZED = requests.codes.unauthorized
+NOT_FOUND = requests.codes.not_found
+
+# The success codes check_error accepts, as one O(1) membership test.
+OK_CODES = frozenset((OK, ACCEPTED))
+
+# URL args repeat heavily (the same table ID for every push, one project
+# ID for every query), so cache their quoted forms.
+@lru_cache(maxsize=256)
+def _quote_arg(arg):
+    return quote(arg, safe='')
+
+# Connection pool size for the REST session. Polaris calls all go to the
+# same host, so a generous pool keeps warm TLS connections available even
+# when the client is used from multiple threads.
+POOL_SIZE = 32
+
+# How long, in seconds, cached table summaries stay fresh. Short enough
+# that interactive users see new tables promptly, long enough that a
+# script resolving many names pays for one fetch, not one per name.
+TABLE_CACHE_TTL = 5.0
+
+# Event count above which push_events streams the NDJSON body with
+# chunked transfer encoding instead of buffering it in memory.
+PUSH_STREAM_THRESHOLD = 10000
+
+# Buffered push_events bodies larger than this many bytes are gzipped
+# before sending. NDJSON with a repeated schema compresses to a small
+# fraction of its raw size, which beats the compression CPU cost on any
+# non-local link.
+PUSH_GZIP_THRESHOLD = 4096
+
+def new_session(retries=True):
+    """
+    Creates a requests Session tuned for bursts of calls to a single
+    Polaris host: a larger connection pool than the requests default,
+    keep-alive connections, and retries with backoff for transient errors.
+
+    Pass retries=False for requests whose bodies cannot be replayed
+    (streaming generators): urllib3 would re-send an exhausted body as
+    zero bytes, so such requests must not be retried automatically.
+    """
+    session = requests.Session()
+    if retries:
+        max_retries = Retry(
+            total=3,
+            backoff_factor=0.2,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(['GET', 'POST', 'DELETE']))
+    else:
+        max_retries = 0
+    adapter = HTTPAdapter(
+        pool_connections=POOL_SIZE,
+        pool_maxsize=POOL_SIZE,
+        max_retries=max_retries)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers['Connection'] = 'keep-alive'
+    # requests sends this by default, but advertise it explicitly: JSON
+    # responses compress ~10x and wire time dominates on remote links.
+    session.headers['Accept-Encoding'] = 'gzip, deflate'
+    return session
+
 class NotFoundException(Exception):
 
     def __init__(self, msg):
@@ -45,35 +138,53 @@ class Client:
         self.client_id = client_id
         self.secret = secret
         self.domain = "" if is_blank(domain) else domain + "."
-        self._trace = False
+        # The domain never changes after construction, so resolve the base
+        # URL once rather than re-formatting it on every request.
+        self._url_base = BASE_URL.format(self.domain)
+        self._url_cache = {}
         self.token = None
-        self.session = requests.Session()
+        self._token_expiry = 0
+        self.session = new_session()
+        # The token endpoint lives on a different host (id.*.imply.io) than
+        # the API host. Keep its connections on a separate session so token
+        # renewal never evicts warm API sockets from the main pool.
+        self._auth_session = new_session()
+        # Streaming push bodies are one-shot generators, so they go out
+        # on a session without automatic retries (see new_session).
+        self._stream_session = new_session(retries=False)
         self._show = None
         self._project_id = None
+        self._name_cache = None
+        self._name_cache_cf = None
+        self._name_cache_ts = 0
+        self._projects_cache = None
+        self._projects_index = None
         self.renew_token()
 
     #-------- REST --------
 
     def trace(self, flag):
-        self._trace = flag == True
+        """
+        Enables or disables tracing of REST requests via the
+        'polaris_client' logger at DEBUG level.
+        """
+        if flag:
+            log.setLevel(logging.DEBUG)
+            if not log.handlers:
+                log.addHandler(logging.StreamHandler())
+        else:
+            log.setLevel(logging.NOTSET)
     
-    def _get_error_msg(self, json):
+    def _get_error_msg(self, payload):
         # { "code": 400, "message": "Unable to process JSON" }
-        msg = dict_get(json, 'message')
-        if not is_blank(msg):
-            return msg
-
         # { "error": { "code": "AlreadyExists",
         # "message": "A table with name [Example Table] already exists", ...
-        error_obj = json.get('error')
-        if error_obj is None:
-            return None
-        msg = error_obj.get('message')
-        if not is_blank(msg):
-            return msg
-        msg = error_obj.get('code')
-        if not is_blank(msg):
-            return msg
+        error_obj = payload.get('error') or {}
+        for msg in (payload.get('message'), error_obj.get('message'), error_obj.get('code')):
+            # The message is normally a string, but guard the blank check:
+            # a numeric code here should come back as-is, not raise.
+            if msg and not (isinstance(msg, str) and msg.isspace()):
+                return msg
         return None
     
     def check_error(self, response):
@@ -85,31 +196,38 @@ class Client:
         payload, if any, is returned in the json field of the error.
         """
         code = response.status_code
-        if code == requests.codes.ok or code == requests.codes.accepted:
+        if code in OK_CODES:
             return
        
-        if self._trace and response.text is not None:
-            print("Error: ", response.text)
+        if log.isEnabledFor(logging.DEBUG) and response.text is not None:
+            log.debug("Error: %s", response.text)
         error = None
-        json = None
-        try:
-            json = response.json()
-            error = self._get_error_msg(json)
-        except Exception:
-            pass
-        if code == requests.codes.not_found and error is None:
+        payload = None
+        # Only attempt a parse when there is a body and it claims to be
+        # JSON: empty DELETE responses would otherwise raise (and swallow)
+        # a ValueError on every call.
+        if response.content and 'json' in response.headers.get('content-type', ''):
+            try:
+                payload = response.json()
+            except ValueError:
+                pass
+            # An error body can be valid JSON without being an object
+            # (e.g. a bare list); only an object carries a message.
+            if isinstance(payload, dict):
+                error = self._get_error_msg(payload)
+        if code == NOT_FOUND and error is None:
             error = "Not found"
         if error is not None:
             response.reason = error
-        if code == requests.codes.not_found:
+        if code == NOT_FOUND:
             e = NotFoundException(error)
             e.response = response
-            e.json = json
+            e.json = payload
             raise e
         try:
             response.raise_for_status()
         except Exception as e:
-            e.json = json
+            e.json = payload
             raise e
 
     def build_url(self, req, args=None) -> str:
@@ -126,17 +244,20 @@ class Client:
             optional list of values to match {} placeholders
             in the URL.
         """
-        url = BASE_URL + req
-        quoted = [self.domain]
-        if args is not None:
-            quoted += [quote(arg) for arg in args]
-        url = url.format(*quoted)
-        return url
+        if args is None:
+            # No placeholders: the full URL is a constant per endpoint,
+            # so build each one once and reuse it.
+            url = self._url_cache.get(req)
+            if url is None:
+                url = self._url_base + req
+                self._url_cache[req] = url
+            return url
+        return self._url_base + req.format(*[_quote_arg(arg) for arg in args])
 
     def add_token(self, headers):
-        if headers is None:
-            headers = {}
-        headers["Authorization"] = "Bearer " + self.token['access_token']
+        # The Authorization header lives on the session (see renew_token),
+        # so there is nothing to add here: this method survives only to
+        # pass along any caller-supplied headers.
         return headers
 
     def submit(self, req, headers=None):
@@ -148,8 +269,13 @@ class Client:
 
         See https://docs.imply.io/polaris/oauth/
         '''
+        # Renew a token that is about to expire before sending, which
+        # avoids paying for a doomed request plus its 401 retry. The 401
+        # path below remains as a safety net.
+        if time.monotonic() >= self._token_expiry:
+            self.renew_token()
         r = req(self.session, self.add_token(headers))
-        if r.status_code == requests.codes.unauthorized:
+        if r.status_code == UNAUTHORIZED:
             self.renew_token()
             r = req(self.session, self.add_token(headers))
         return r
@@ -183,8 +309,7 @@ class Client:
         The `requests` `Request` object.
         '''
         url = self.build_url(req, args)
-        if self._trace:
-            print("GET:", url)
+        log.debug("GET %s", url)
         r = self.submit(lambda session, h: session.get(url, params=params, headers=h))
         if require_ok:
             self.check_error(r)
@@ -204,12 +329,9 @@ class Client:
         parameters.
         """
         url = self.build_url(req, args)
-        if self._trace:
-            print("POST:", url)
-            print("body:", body)
+        log.debug("POST %s body=%r", url, body)
         r = self.submit(lambda session, h: session.post(url, data=body, headers=h), headers)
-        if self._trace:
-            print("Response code:", r.status_code)
+        log.debug("Response code: %s", r.status_code)
         if require_ok:
             self.check_error(r)
         return r
@@ -233,22 +355,74 @@ class Client:
         Does not parse error messages: that is up to the caller.
         """
         url = self.build_url(req, args)
-        if self._trace:
-            print("POST:", url)
-            print("body:", body)
-        return self.submit(lambda session, h: session.post(url, json=body, headers=h), headers)
+        log.debug("POST %s body=%r", url, body)
+        # Encode the body here (with orjson when available) rather than
+        # letting requests run the stdlib encoder via json=body.
+        data = json_dumps(body)
+        headers = {} if headers is None else dict(headers)
+        headers.setdefault('Content-Type', 'application/json')
+        return self.submit(lambda session, h: session.post(url, data=data, headers=h), headers)
 
     def delete_req(self, req, args=None, headers=None):
         url = self.build_url(req, args)
-        if self._trace:
-            print("DELETE:", url)
+        log.debug("DELETE %s", url)
         return self.submit(lambda session, h: session.delete(url, headers=h), headers)
 
     def delete_json(self, req, args=None, headers=None):
-        return self.delete_req(req, args, headers).json()
+        r = self.delete_req(req, args, headers)
+        if r.status_code == NO_CONTENT or not r.content:
+            return None
+        return r.json()
 
     #-------- Misc --------
 
+    def map_requests(self, fn, items, max_workers=16):
+        """
+        Applies a REST-calling function to each item concurrently and
+        returns the results in item order.
+
+        Independent calls such as table_details(id) over many IDs are
+        latency-bound; fanning them out over a thread pool makes N calls
+        take roughly one round-trip instead of N. The session's connection
+        pool is sized to support this (see new_session), and the client is
+        safe for concurrent read-style calls.
+
+        Parameters
+        ----------
+        fn: callable
+            Function of one item which issues the REST call.
+            Example: `client.map_requests(client.table_details, ids)`
+
+        items: list
+            The items to pass to `fn`, one call per item.
+
+        max_workers: int, default = 16
+            Maximum number of concurrent calls.
+
+        Returns
+        -------
+        A list of the return values of `fn`, in the same order as `items`.
+        If any call raises, the exception propagates after all calls finish.
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return list(pool.map(fn, items))
+
+    def gather(self, *calls):
+        """
+        Runs several independent REST calls concurrently and returns
+        their results in argument order.
+
+        Pass zero-argument callables; use a lambda to bind arguments:
+
+        tables, projects = client.gather(
+            client.all_table_summaries,
+            client.projects)
+
+        Wall time is roughly the slowest call instead of the sum, since
+        the calls overlap on the session's connection pool.
+        """
+        return self.map_requests(lambda call: call(), calls)
+
     def show(self):
         """
         Returns an object which displays Polaris information as either a plain-text
@@ -280,9 +454,17 @@ class Client:
             "grant_type": "client_credentials",
         }
 
-        r = self.session.post(POST_TOKEN.format(self.domain, self.org), data=params)
+        r = self._auth_session.post(POST_TOKEN.format(self.domain, self.org), data=params)
         r.raise_for_status()
         self.token = r.json()
+        # Treat the token as expired 30 seconds early so a request never
+        # leaves with a ticket about to lapse in flight.
+        self._token_expiry = time.monotonic() + self.token.get('expires_in', 300) - 30
+        # Build the bearer header once per renewal rather than on every
+        # request: the sessions apply it to all API calls automatically.
+        auth = "Bearer " + self.token['access_token']
+        self.session.headers['Authorization'] = auth
+        self._stream_session.headers['Authorization'] = auth
 
     #-------- Tables --------
 
@@ -301,9 +483,10 @@ class Client:
         See https://docs.imply.io/polaris/api-create-table/
         See https://docs.imply.io/polaris/TablesApi/#create-a-table
         """
-        if type(table) is str:
+        if isinstance(table, str):
             table = {'name': table}
         details = self.post_json(REQ_TABLES, table)
+        self.invalidate_tables()
         return Table(self, details)
 
     def drop_table(self, table_id):
@@ -319,7 +502,9 @@ class Client:
         table_id: str
             The ID for the table.
         """
-        return self.delete_req(REQ_TABLE, args=[table_id])
+        r = self.delete_req(REQ_TABLE, args=[table_id])
+        self.invalidate_tables()
+        return r
 
     def all_table_summaries(self):
         """
@@ -351,17 +536,65 @@ class Client:
         """
         return self.get_json(REQ_TABLES, params={'detail': 'detailed'})['values']
 
+    def iter_table_summaries(self):
+        """
+        Yields the summary information for all tables, one table at a time.
+
+        Unlike all_table_summaries(), the response is streamed: with the
+        optional `ijson` package installed, a caller scanning for one table
+        stops downloading and parsing as soon as it finds a match, and the
+        full list is never held in memory. Without `ijson`, falls back to
+        parsing the complete response.
+
+        Calls GET /v1/tables?detail=summary
+
+        See all_table_summaries()
+        """
+        return self._iter_tables('summary')
+
+    def iter_table_details(self):
+        """
+        Yields the detail information for all tables, one table at a time.
+
+        See iter_table_summaries() for the streaming behavior.
+
+        Calls GET /v1/tables?detail=detailed
+
+        See all_table_details()
+        """
+        return self._iter_tables('detailed')
+
+    def _iter_tables(self, detail):
+        url = self.build_url(REQ_TABLES)
+        params = {'detail': detail}
+        r = self.submit(lambda session, h:
+                        session.get(url, params=params, headers=h, stream=True))
+        self.check_error(r)
+        if ijson is None:
+            yield from r.json()['values']
+            return
+        try:
+            # Have urllib3 undo any content encoding as we read.
+            r.raw.decode_content = True
+            yield from ijson.items(r.raw, 'values.item')
+        finally:
+            r.close()
+
     def resolve_table_name(self, table_name):
         """
         Returns table summary information given a table name.
 
-        Calls `GET /v1/tables?name={table_name}`
+        Lookups are served from a cache built from one
+        `GET /v1/tables?detail=summary` fetch and kept for
+        TABLE_CACHE_TTL seconds, so results can be that far out of date.
+        Call invalidate_tables() to force a fresh fetch. An exact name
+        match is preferred; failing that, a case-insensitive match.
 
         Parameters
         ----------
         table_name: str
             The name of the table.
-        
+
         Returns
         -------
         A dict with the table name, id, description and last update time,
@@ -369,22 +602,51 @@ class Client:
 
         See https://docs.imply.io/polaris/api-table-id/
         """
-        values = self.get_json(REQ_TABLES, params={'name': table_name})['values']
-        if len(values) == 0:
-            return None
-        return values[0]
+        cache = self._table_cache()
+        info = cache.get(table_name)
+        if info is not None:
+            return info
+        # Fall back to a case-insensitive match, mirroring project lookup.
+        return self._name_cache_cf.get(table_name.casefold())
+
+    def _table_cache(self):
+        """
+        Internal method which returns the summaries of all tables as a dict
+        keyed by table name, fetching them when the cache is stale.
+
+        Resolving N names costs one round-trip instead of N, at the cost of
+        results being up to TABLE_CACHE_TTL seconds old.
+        """
+        if self._name_cache is None or time.monotonic() - self._name_cache_ts >= TABLE_CACHE_TTL:
+            values = self.all_table_summaries()
+            self._name_cache = {v['name']: v for v in values}
+            self._name_cache_cf = {v['name'].casefold(): v for v in values}
+            self._name_cache_ts = time.monotonic()
+        return self._name_cache
+
+    def invalidate_tables(self):
+        """
+        Discards the cached table summaries so the next name lookup
+        fetches a fresh list.
+
+        Called internally after create_table() and drop_table(); call it
+        directly if tables change outside this client.
+        """
+        self._name_cache = None
 
     def table_id(self, table_name):
         """
         Returns the ID for a table given the table name.
 
-        Calls `GET /v1/tables?name={table_name}`
+        Resolved through the cached table summaries: see
+        resolve_table_name() for the staleness window and the
+        case-insensitive fallback.
 
         Parameters
         ----------
         table_name: str
             The name of the table.
-        
+
         Returns
         -------
         The Table ID, or None if the table is not defined.
@@ -484,10 +746,14 @@ class Client:
 
     #-------- Ingestion --------
 
-    def push_events(self, table_id, events):
+    def push_events(self, table_id, events, chunk_size=1000, concurrency=4):
         """
         Push (insert) events into a table using its input schema.
 
+        Batches larger than chunk_size are split and the chunks POSTed
+        concurrently over the session's keep-alive connection pool, hiding
+        the per-request round-trip behind parallel in-flight requests.
+
         Parameters
         ----------
         table_id: str
@@ -496,18 +762,70 @@ class Client:
             The event(s) to push. Can be a single event as a dict, or an arrary
             of such objects. Each object must include the `__time` column, along
             with the other columns defined in the input schema.
+        chunk_size: int, default = 1000
+            Maximum events per POST. Pass None to send everything in one
+            request (very large batches then stream with chunked encoding).
+        concurrency: int, default = 4
+            Maximum number of chunk POSTs in flight at once.
+
+        Returns
+        -------
+        The response for a single POST, or the list of responses, one per
+        chunk, when the batch was split. If any chunk fails, the error
+        propagates after in-flight chunks finish.
 
         See https://docs.imply.io/polaris/api-stream/
         See https://docs.imply.io/polaris/EventsApi/
         """
         if events is None:
             return
-        if type(events) is not list:
+        if not isinstance(events, list):
             events = [events]
+        if chunk_size is not None and len(events) > chunk_size:
+            chunks = [events[i:i + chunk_size]
+                      for i in range(0, len(events), chunk_size)]
+            return self.map_requests(
+                lambda chunk: self._push_chunk(table_id, chunk),
+                chunks, max_workers=concurrency)
+        return self._push_chunk(table_id, events)
+
+    def _push_chunk(self, table_id, events):
         # PITA: format must be line-delimited JSON
         # (JSON Lines: https://jsonlines.org/)
-        lines = [json.dumps(event) for event in events]
-        return self.post(REQ_EVENTS, '\n'.join(lines), args=[table_id])
+        headers = {'Content-Type': 'application/x-ndjson'}
+        if len(events) > PUSH_STREAM_THRESHOLD:
+            # Huge batch: hand requests a generator so the body goes out
+            # with chunked transfer encoding, one event in memory at a
+            # time. A generator is one-shot, so each attempt must build a
+            # fresh one (the 401 path in submit re-invokes the lambda),
+            # and the POST uses the no-retry session because urllib3
+            # cannot rewind a generator body for its own retries.
+            url = self.build_url(REQ_EVENTS, args=[table_id])
+            log.debug("POST %s (streaming)", url)
+            r = self.submit(
+                lambda session, h: self._stream_session.post(
+                    url,
+                    data=(json_dumps(event) + b'\n' for event in events),
+                    headers=h),
+                headers)
+            self.check_error(r)
+            return r
+        else:
+            # Encode straight into one bytes buffer rather than a list of
+            # strings joined at the end: half the peak memory, and the
+            # request keeps a Content-Length header.
+            buf = bytearray()
+            for event in events:
+                buf += json_dumps(event)
+                buf += b'\n'
+            # Polaris tolerates the trailing newline, but there is no
+            # reason to send it.
+            del buf[-1:]
+            body = bytes(buf)
+            if len(body) > PUSH_GZIP_THRESHOLD:
+                body = gzip.compress(body, compresslevel=1)
+                headers['Content-Encoding'] = 'gzip'
+        return self.post(REQ_EVENTS, body, args=[table_id], headers=headers)
 
     def enable_push_for_table(self, table_id):
         return self.post(REQ_ENABLE_PUSH, '', args=[table_id])
@@ -525,9 +843,24 @@ class Client:
 
         Calls `/v1/projects`
 
+        Projects change rarely, so the list is fetched once and cached for
+        the life of the client. Call refresh_projects() to force a refetch.
+
         See https://docs.imply.io/polaris/api-query/#get-project-id
         """
-        return self.get_json(REQ_PROJECTS)
+        if self._projects_cache is None:
+            self._projects_cache = self.get_json(REQ_PROJECTS)
+            self._projects_index = {
+                p['metadata']['name'].casefold(): p for p in self._projects_cache}
+        return self._projects_cache
+
+    def refresh_projects(self):
+        """
+        Discards the cached project list so the next call to projects()
+        (or any method that resolves a project) fetches a fresh copy.
+        """
+        self._projects_cache = None
+        self._projects_index = None
 
     def set_project(self, proj_name):
         proj = self.project(proj_name)
@@ -551,12 +884,8 @@ class Client:
 
         See projects()
         """
-        projects = self.projects()
-        target = proj_name.casefold()
-        for p in projects:
-            if p['metadata']['name'].casefold() == target:
-                return p
-        return None
+        self.projects()
+        return self._projects_index.get(proj_name.casefold())
 
     def default_project(self):
         """
@@ -564,11 +893,7 @@ class Client:
 
         See project(proj_name)
         """
-        projects = self.projects()
-        for p in projects:
-            if p['metadata']['name'] == consts.DEFAULT_PROJECT:
-                return p
-        return None
+        return self.project(consts.DEFAULT_PROJECT)
 
     def infer_project(self):
         projects = self.projects()
@@ -577,10 +902,10 @@ class Client:
         if len(projects) == 1:
             self._project_id = projects[0]['metadata']['uid']
             return
-        for p in projects:
-            if p['metadata']['name'] == consts.DEFAULT_PROJECT:
-                self._project_id = p['metadata']['uid']
-                return
+        proj = self._projects_index.get(consts.DEFAULT_PROJECT.casefold())
+        if proj is not None:
+            self._project_id = proj['metadata']['uid']
+            return
         raise Exception("More than one project defined: please call set_project()")
 
     #-------- Query --------
@@ -623,9 +948,9 @@ class Client:
 
     def delete_file(self, name):
         r = self.delete_req(REQ_FILE, args=[name])
-        if r.status_code == requests.codes.no_content:
+        if r.status_code == NO_CONTENT:
             return
-        if r.status_code == requests.codes.not_found:
+        if r.status_code == NOT_FOUND:
             raise NotFoundException("File not found: " + name)
         self.check_error(r)
 
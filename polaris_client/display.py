@@ -67,13 +67,9 @@ class Display:
 
 def list_to_table(table, objects, cols):
     cols = infer_keys(objects) if cols is None else cols
-    rows = []
-    for obj in objects:
-        row = []
-        for key in cols.keys():
-            row.append(obj.get(key))
-        rows.append(row)
-    table.headers([head for head in cols.values()])
+    items = list(cols.items())
+    rows = [[obj.get(key) for key, _ in items] for obj in objects]
+    table.headers([head or key for key, head in items])
     table.show(rows)
 
 def object_to_table(table, obj, labels):
@@ -82,14 +78,12 @@ def object_to_table(table, obj, labels):
     for key, head in labels.items():
         value = obj.get(key)
         value = '' if value is None else str(value)
-        table_rows.append([head, value])
+        table_rows.append([head or key, value])
     table.headers(['Key', 'Value'])
     table.show(table_rows)
 
 def infer_keys(data):
-    if type(data) is list:
+    if isinstance(data, list):
         data = data[0]
-    keys = {}
-    for key in data.keys():
-        keys[key] = key
-    return keys
\ No newline at end of file
+    # A None label means "use the key itself as the header."
+    return dict.fromkeys(data.keys())
\ No newline at end of file
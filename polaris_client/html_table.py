@@ -12,9 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from IPython.display import display, HTML
 from .base_table import BaseTable
 
+# IPython is imported lazily in html() and styles(): it costs hundreds of
+# milliseconds to load, which script users who never render HTML should
+# not pay just for importing the package.
+
 STYLES = '''
 <style>
   .druid table {
@@ -46,10 +49,12 @@ STYLES = '''
 '''
 
 def html(s):
+    from IPython.display import display, HTML
     s =  '<div class="druid">' + s + '</div>'
     display(HTML(s))
 
 def styles():
+    from IPython.display import display, HTML
     display(HTML(STYLES))
 
 def alert(s):
@@ -69,9 +74,7 @@ def start_tag(tag, align):
 class HtmlTable(BaseTable):
 
     def __init__(self):
-        self._headers = None
-        self._align = None
-        self._col_fmt = None
+        BaseTable.__init__(self)
 
     def widths(self, widths):
         self._widths = widths
@@ -80,33 +83,43 @@ class HtmlTable(BaseTable):
         _, width = self.row_width(rows)
         headers = self.pad_headers(width)
         rows = self.pad_rows(rows, width)
+        # Column alignment is fixed across rows, so render each column's
+        # open tag once rather than per cell.
+        td_open = tuple(start_tag('td', self.col_align(i)) for i in range(width))
+        th_open = tuple(start_tag('th', self.col_align(i)) for i in range(width))
         s = '<table>\n'
-        s += self.gen_header(headers)
-        s += self.gen_rows(rows)
+        s += self.gen_header(headers, th_open)
+        s += self.gen_rows(rows, td_open)
         return s + '\n</table>'
 
     def show(self, rows):
         html(self.format(rows))
 
-    def gen_header(self, headers):
+    def gen_header(self, headers, th_open):
         if headers is None or len(headers) == 0:
             return ''
-        s = '<tr>'
+        parts = ['<tr>']
         for i in range(len(headers)):
-            s += start_tag('th', self.col_align(i)) + headers[i] + '</th>'
-        return s + '</tr>\n'
-
-    def gen_rows(self, rows):
+            parts.append(th_open[i])
+            parts.append(headers[i])
+            parts.append('</th>')
+        parts.append('</tr>\n')
+        return ''.join(parts)
+
+    def gen_rows(self, rows, td_open):
+        # Accumulate fragments and join once per row: += on strings
+        # reallocates the row-so-far for every cell.
         html_rows = []
         for row in rows:
-            r = "<tr>"
-            for i in range(len(row)):
-                cell = row[i]
-                r += start_tag('td', self.col_align(i))
-                value = '' if cell is None else str(cell)
-                r += value + '</td>'
-            html_rows.append(r + "</tr>")
-        return "\n".join(html_rows)
+            parts = ['<tr>']
+            append = parts.append
+            for i, cell in enumerate(row):
+                append(td_open[i])
+                append('' if cell is None else str(cell))
+                append('</td>')
+            append('</tr>')
+            html_rows.append(''.join(parts))
+        return '\n'.join(html_rows)
 
     def col_align(self, col):
         if self._align is None:
@@ -13,7 +13,6 @@
 # limitations under the License.
 
 import requests
-from xmlrpc.client import Boolean
 
 SUMMARY_LABELS = {
     'name': "Name",
@@ -33,6 +32,7 @@ class Table:
         self._name = info['name']
         self._id = info['id']
         self._schema = None
+        self._details = None
 
     def client(self):
         return self._client
@@ -53,7 +53,21 @@ class Table:
         return self._client.table_summary(self._id)
 
     def details(self):
-        return self._client.table_details(self._id)
+        """
+        Returns the detail metadata for this table, fetched on first use
+        and cached. Call refresh() to force a refetch.
+        """
+        if self._details is None:
+            self._details = self._client.table_details(self._id)
+        return self._details
+
+    def refresh(self):
+        """
+        Refetches the detail metadata from Polaris, replacing any
+        cached copy.
+        """
+        self._details = self._client.table_details(self._id)
+        return self._details
 
     def input_schema(self):
         return self.details().get('inputSchema')
@@ -120,7 +134,7 @@ class Table:
         """
         self._client.drop_table(self._id)
 
-    def exists(self) -> Boolean:
+    def exists(self) -> bool:
         """
         Check if the table exists.
 
@@ -129,7 +143,7 @@ class Table:
         name.
         """
         try:
-            self.details()
+            self.refresh()
             return True
         except requests.HTTPError as e:
             if e.response is not None and e.response.status_code == requests.codes.not_found:
@@ -137,11 +151,13 @@ class Table:
             raise e
 
     def enable_push(self):
+        self._details = None
         return self._client.enable_push_for_table(self._id)
 
     def disable_push(self):
+        self._details = None
         self._client.disable_push_for_table(self._id)
 
     def is_push_enabled(self):
-        details = self.details()
+        details = self.refresh()
         return details.get('pushEndpointUrl') is not None
\ No newline at end of file
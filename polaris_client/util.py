@@ -12,12 +12,16 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from functools import lru_cache
+
 def is_blank(s):
     """
     Returns True if the given string is None or blank (after stripping spaces),
     False otherwise.
     """
-    return s is None or len(s.strip()) == 0
+    # str.isspace() is a single C-level scan with no copy, unlike strip().
+    # It returns False for '', hence the separate emptiness check.
+    return s is None or len(s) == 0 or s.isspace()
 
 def dict_get(dict, key, default=None):
     """
@@ -29,18 +33,24 @@ def dict_get(dict, key, default=None):
     return dict.get(key, default)
 
 def padded(array, width, fill):
-    if array is not None and len(array) >= width:
-        return array
     if array is None:
-        result = []
-    else:
-        result = array.copy()
-    return pad(result, width, fill)
-    
+        return [fill] * width
+    if len(array) >= width:
+        return array
+    # List concat/repeat run at C speed; only the tail is newly allocated.
+    return array + [fill] * (width - len(array))
+
 def pad(array, width, fill):
-    for _ in range(len(array), width):
-        array.append(fill)
+    if len(array) < width:
+        array += [fill] * (width - len(array))
     return array
 
 def druid_timestamp(dt):
-    dt.isoformat() + 'Z'
\ No newline at end of file
+    """
+    Formats a datetime in the ISO form Druid expects for `__time` values.
+    """
+    return dt.isoformat() + 'Z'
+
+# Cached variant for event batches that share timestamps: formatting the
+# same datetime repeatedly becomes a dict hit.
+druid_timestamp_cached = lru_cache(maxsize=1024)(druid_timestamp)
\ No newline at end of file